@@ -1,9 +1,13 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from collections import defaultdict, deque
+from itertools import count, islice
+from typing import Dict, Iterable, List, Tuple, Optional
 import uuid
 import heapq
+import re
+import sys
 
 
 # =======================
@@ -16,6 +20,16 @@ class Mensaje:
     Entrega 1: encapsulamiento de atributos y métodos de acceso.
     """
 
+    # sin __dict__ por instancia: menos memoria y acceso directo a los atributos
+    __slots__ = (
+        "_id", "_remitente", "_destinatario", "_asunto", "_cuerpo",
+        "_fecha", "_leido", "_prioridad", "_prioridad_num", "_asunto_lc", "_remitente_lc",
+        "_carpetas",
+    )
+
+    # --- Asigna prioridades a numeros (menor numero = mayor prioridad) ---
+    _valor_prioridad = {"Alta": 1, "Media": 2, "Baja": 3}
+
     #--- Valida campos obligatorios y guarda los datos del mensaje ---
     def __init__(
         self,
@@ -27,10 +41,11 @@ class Mensaje:
     ):
         if not destinatario:
             raise ValueError("El mensaje debe tener destinatario.")
-        if prioridad not in {"Alta", "Media", "Baja"}:
+        if prioridad not in self._valor_prioridad:
             prioridad = "Media"
 
-        self._id = str(uuid.uuid4())
+        # el UUID se genera recién cuando alguien lo pide (uuid4 lee de os.urandom)
+        self._id: Optional[str] = None
         self._remitente = remitente
         self._destinatario = destinatario
         self._asunto = asunto
@@ -38,10 +53,20 @@ class Mensaje:
         self._fecha = datetime.now()
         self._leido = False
         self._prioridad = prioridad
-
-    # --- propiedades (encapsulamiento) ---
+        self._prioridad_num = self._valor_prioridad[prioridad]
+        # versiones en minúsculas precalculadas para las búsquedas
+        self._asunto_lc = asunto.lower()
+        self._remitente_lc = remitente.lower()
+        # carpetas que contienen este mensaje (p. ej. Enviados del remitente y Entrada
+        # del destinatario), para mantener al día sus contadores de no leídos.
+        # Tupla y no lista: la tupla vacía es compartida y casi siempre son 1 o 2 carpetas.
+        self._carpetas: Tuple["Carpeta", ...] = ()
+
+    # --- propiedades (encapsulamiento); los recorridos internos del módulo leen los slots directamente ---
     @property
     def id(self) -> str:
+        if self._id is None:
+            self._id = str(uuid.uuid4())
         return self._id
 
     @property
@@ -68,17 +93,35 @@ class Mensaje:
     def prioridad(self) -> str:
         return self._prioridad
 
+    @property
+    def prioridad_num(self) -> int:
+        return self._prioridad_num
+
     @property
     def leido(self) -> bool:
         return self._leido
 
     # --- Cambia el estado del mensaje a "leido" ---
     def marcar_leido(self) -> None:
-        self._leido = True
+        if not self._leido:
+            self._leido = True
+            for carpeta in self._carpetas:
+                carpeta.registrar_cambio_leido(self)
 
     # --- Cambia el estado del mensaje a "no leido" ---
     def marcar_no_leido(self) -> None:
-        self._leido = False
+        if self._leido:
+            self._leido = False
+            for carpeta in self._carpetas:
+                carpeta.registrar_cambio_leido(self)
+
+    # --- Carpeta avisa acá cuando el mensaje entra o sale de ella ---
+    def vincular_carpeta(self, carpeta: "Carpeta") -> None:
+        self._carpetas += (carpeta,)
+
+    def desvincular_carpeta(self, carpeta: "Carpeta") -> None:
+        i = self._carpetas.index(carpeta)
+        self._carpetas = self._carpetas[:i] + self._carpetas[i + 1:]
     # --- representacion legible del mensaje ---
     def __repr__(self) -> str:
         marca = "✓" if self._leido else "•"
@@ -91,12 +134,35 @@ class Carpeta:
     Entrega 2: soporta subcarpetas recursivas.
     """
 
+    __slots__ = (
+        "_nombre", "_mensajes", "_subcarpetas", "_padre", "_indice_busqueda",
+        "_no_leidos", "_por_prioridad",
+    )
+
+    # separa campos dentro del índice de búsqueda, para que casi nunca haya
+    # coincidencias entre un campo y el siguiente (igual se confirman mensaje a mensaje)
+    _SEPARADOR = "\0"
+
+    # el índice es una segunda copia del texto en minúsculas: solo compensa en carpetas
+    # grandes; las chicas (interactivas) buscan directo sobre _asunto_lc/_remitente_lc
+    _MIN_MENSAJES_INDICE = 2048
+
+    # mensajes por bloque del índice: agregar rearma solo el último bloque y un
+    # carácter ancho (p. ej. un emoji) solo agranda el string de su propio bloque
+    _BLOQUE_INDICE = 512
+
     # --- Crea una carpeta, opcionalmente ligada a un padre en el arbol ---
     def __init__(self, nombre: str, padre: Optional["Carpeta"] = None):
         self._nombre = nombre
         self._mensajes: List[Mensaje] = []
         self._subcarpetas: Dict[str, "Carpeta"] = {}
         self._padre = padre
+        # (bloques de texto unido de asuntos/remitentes en minúsculas, mensajes incluidos);
+        # se arma a demanda y se actualiza por bloques al agregar o quitar mensajes
+        self._indice_busqueda: Optional[Tuple[List[str], int]] = None
+        # contadores incrementales: se leen en O(1) sin recorrer los mensajes
+        self._no_leidos = 0
+        self._por_prioridad: List[int] = [0] * len(Mensaje._valor_prioridad)
 
     @property
     def nombre(self) -> str:
@@ -110,17 +176,107 @@ class Carpeta:
     def subcarpetas(self) -> Dict[str, "Carpeta"]:
         return self._subcarpetas
 
+    @property
+    def cantidad_no_leidos(self) -> int:
+        return self._no_leidos
+
+    @property
+    def cantidad_por_prioridad(self) -> Dict[str, int]:
+        return {p: self._por_prioridad[n - 1] for p, n in Mensaje._valor_prioridad.items()}
+
+    # --- Registra/desregistra un mensaje en los contadores de la carpeta ---
+    def _vincular(self, mensaje: Mensaje) -> None:
+        mensaje.vincular_carpeta(self)
+        if not mensaje._leido:
+            self._no_leidos += 1
+        self._por_prioridad[mensaje._prioridad_num - 1] += 1
+
+    # --- Mensaje avisa acá cuando cambia su estado leído/no leído ---
+    def registrar_cambio_leido(self, mensaje: Mensaje) -> None:
+        self._no_leidos += -1 if mensaje._leido else 1
+
+    def _desvincular(self, mensaje: Mensaje) -> None:
+        mensaje.desvincular_carpeta(self)
+        if not mensaje._leido:
+            self._no_leidos -= 1
+        self._por_prioridad[mensaje._prioridad_num - 1] -= 1
+
     # --- agrega un mensaje a esta carpeta ---
     def agregar_mensaje(self, mensaje: Mensaje) -> None:
         self._mensajes.append(mensaje)
+        self._vincular(mensaje)
+
+    # --- agrega varios mensajes (un extend a la lista y luego actualiza contadores) ---
+    def agregar_muchos(self, mensajes: Iterable[Mensaje]) -> None:
+        nuevos = list(mensajes)
+        self._mensajes.extend(nuevos)
+        for m in nuevos:
+            self._vincular(m)
     # --- Elimina un mensaje si existe alguno en la carpeta ---
     def quitar_mensaje(self, mensaje: Mensaje) -> None:
-        self._mensajes.remove(mensaje)
+        self.quitar_por_indice(self._mensajes.index(mensaje))
+
+    # --- Extrae el mensaje en la posición 'idx' sin buscarlo por igualdad ---
+    def quitar_por_indice(self, idx: int) -> Mensaje:
+        if idx < 0:
+            idx += len(self._mensajes)
+        mensaje = self._mensajes.pop(idx)
+        self._recortar_indice(idx)
+        self._desvincular(mensaje)
+        return mensaje
 
     def mensajes(self) -> List[Mensaje]:
         # devuelvo copia para no exponer la lista interna
         return list(self._mensajes)
 
+    # --- Mensajes cuyo asunto o remitente contienen 'texto' (sin distinguir mayúsculas) ---
+    def buscar_mensajes(self, texto: str) -> List[Mensaje]:
+        """
+        En carpetas grandes cada bloque del índice se descarta con una sola búsqueda
+        en C si no contiene 'texto'; solo los bloques con coincidencia se recorren.
+        """
+        texto_lc = texto.lower()
+        if len(self._mensajes) < self._MIN_MENSAJES_INDICE:
+            return [
+                m for m in self._mensajes
+                if texto_lc in m._asunto_lc or texto_lc in m._remitente_lc
+            ]
+        tam = self._BLOQUE_INDICE
+        resultado: List[Mensaje] = []
+        for i, bloque in enumerate(self._indice_actualizado()):
+            if texto_lc in bloque:
+                resultado.extend(
+                    m for m in self._mensajes[i * tam:(i + 1) * tam]
+                    if texto_lc in m._asunto_lc or texto_lc in m._remitente_lc
+                )
+        return resultado
+
+    # --- Devuelve los bloques del índice; solo rearma el último bloque incompleto y los nuevos ---
+    def _indice_actualizado(self) -> List[str]:
+        bloques, indexados = self._indice_busqueda or ([], 0)
+        total = len(self._mensajes)
+        if indexados < total:
+            tam = self._BLOQUE_INDICE
+            desde = indexados - indexados % tam
+            del bloques[desde // tam:]
+            sep = self._SEPARADOR
+            for inicio in range(desde, total, tam):
+                bloques.append("".join(
+                    m._asunto_lc + sep + m._remitente_lc + sep
+                    for m in self._mensajes[inicio:inicio + tam]
+                ))
+            self._indice_busqueda = (bloques, total)
+        return bloques
+
+    # --- Al quitar el mensaje 'idx' se descartan solo los bloques desde su posición ---
+    def _recortar_indice(self, idx: int) -> None:
+        if self._indice_busqueda is None:
+            return
+        bloques, indexados = self._indice_busqueda
+        conservar = min(idx // self._BLOQUE_INDICE, len(bloques))
+        del bloques[conservar:]
+        self._indice_busqueda = (bloques, min(indexados, conservar * self._BLOQUE_INDICE))
+
     def obtener_por_indice(self, idx: int) -> Optional[Mensaje]:
         return self._mensajes[idx] if 0 <= idx < len(self._mensajes) else None
 
@@ -140,22 +296,32 @@ class Carpeta:
         if not self._mensajes:
             print("No hay mensajes.")
             return
-        for i, m in enumerate(self._mensajes, start=1):
-            marca = "✓" if m.leido else "•"
+
+        def _linea(i: int, m: Mensaje) -> str:
+            marca = "✓" if m._leido else "•"
             pref = f"{i}. " if con_indices else ""
-            print(
-                f"{pref}{marca} {m.fecha:%Y-%m-%d %H:%M} | "
-                f"De: {m.remitente} | Asunto: {m.asunto} | Prioridad: {m.prioridad}"
+            return (
+                f"{pref}{marca} {m._fecha:%Y-%m-%d %H:%M} | "
+                f"De: {m._remitente} | Asunto: {m._asunto} | Prioridad: {m._prioridad}\n"
             )
-    # --- Imprime la estructura de carpetas y mensajes de forma recursiva
+
+        # una sola escritura a stdout en lugar de un print por mensaje
+        sys.stdout.write("".join(_linea(i, m) for i, m in enumerate(self._mensajes, start=1)))
+    # --- Imprime la estructura de carpetas y mensajes (recorrido en preorden con pila)
     def listar_contenido(self, nivel: int = 0) -> None:
-        indent = "  " * nivel
-        print(f"{indent}📁 {self._nombre}")
-        for m in self._mensajes:
-            marca = "✓" if m.leido else "•"
-            print(f"{indent}   {marca} {m.asunto}")
-        for sub in self._subcarpetas.values():
-            sub.listar_contenido(nivel + 1)
+        # se arma todo en un buffer y se escribe una sola vez al final
+        salida: List[str] = []
+        pila: List[Tuple["Carpeta", int]] = [(self, nivel)]
+        while pila:
+            carpeta, nivel_actual = pila.pop()
+            indent = "  " * nivel_actual
+            salida.append(f"{indent}📁 {carpeta._nombre}\n")
+            for m in carpeta._mensajes:
+                marca = "✓" if m._leido else "•"
+                salida.append(f"{indent}   {marca} {m._asunto}\n")
+            # se apilan al revés para respetar el orden de inserción
+            pila.extend((sub, nivel_actual + 1) for sub in reversed(carpeta._subcarpetas.values()))
+        sys.stdout.write("".join(salida))
 
 
 # =======================
@@ -167,13 +333,19 @@ class SistemaCorreo:
     Gestiona el árbol de carpetas de un usuario.
 
     Complejidad (peor caso):
-      - buscar_mensajes_recursivo: Tiempo O(N + C), Espacio O(N + D)
-      - mover_mensaje (con carpeta conocida): Tiempo O(1) para extraer/insertar
-        N = total de mensajes, C = total de carpetas, D = profundidad del árbol.
+      - buscar_mensajes_recursivo: Tiempo O(N + C), Espacio O(N + C) (pila explícita)
+      - mover_mensaje (con carpeta conocida): Tiempo O(n) por el desplazamiento de la lista
+        al extraer por índice (sin búsqueda por igualdad), O(1) para insertar
+      - mover_muchos: Tiempo O(k log k + k·n) con k = índices a mover
+        N = total de mensajes, C = total de carpetas,
+        n = mensajes en la carpeta origen.
     """
 
     def __init__(self, carpeta_raiz: Carpeta):
         self._carpeta_raiz = carpeta_raiz
+        # ruta normalizada -> carpeta. Solo se guardan rutas que existen y las carpetas
+        # nunca se borran ni se renombran: crear una carpeta no invalida ninguna entrada.
+        self._path_cache: Dict[str, Carpeta] = {}
 
     @property
     def carpeta_raiz(self) -> Carpeta:
@@ -181,40 +353,50 @@ class SistemaCorreo:
 
     #--- recibe una ruta tipo entrada/importante y devuelve la carpeta correspondiente
     def obtener_por_ruta(self, ruta: str) -> Carpeta:
-        """Navega una ruta tipo 'Entrada/Trabajo/2025'."""
-        partes = ruta.strip("/").split("/")
+        """Navega una ruta tipo 'Entrada/Trabajo/2025' (con caché de rutas ya resueltas)."""
+        normalizada = ruta.strip("/")
+        actual = self._path_cache.get(normalizada)
+        if actual is not None:
+            return actual
         actual = self._carpeta_raiz
-        for p in partes:
+        for p in normalizada.split("/"):
             sub = actual.obtener_subcarpeta(p)
             if not sub:
                 raise ValueError(f"No existe la carpeta '{p}' en la ruta '{ruta}'")
             actual = sub
+        self._path_cache[normalizada] = actual
         return actual
 
     # ---Búsqueda DFS en todo el árbol: recorre subcarpetas y junta coincidencias---
     def buscar_mensajes_recursivo(self, texto: str) -> List[Tuple[Carpeta, Mensaje]]:
         """Búsqueda recursiva por remitente o asunto que contengan 'texto'."""
-        texto = texto.lower()
-
-        def _buscar(carpeta: Carpeta) -> List[Tuple[Carpeta, Mensaje]]:
-            resultado: List[Tuple[Carpeta, Mensaje]] = []
-            for m in carpeta.mensajes():
-                if texto in m.asunto.lower() or texto in m.remitente.lower():
-                    resultado.append((carpeta, m))
-            for sub in carpeta.subcarpetas.values():
-                resultado.extend(_buscar(sub))
-            return resultado
-
-        return _buscar(self._carpeta_raiz)
+        resultado: List[Tuple[Carpeta, Mensaje]] = []
+        pila: List[Carpeta] = [self._carpeta_raiz]
+        while pila:
+            carpeta = pila.pop()
+            resultado.extend((carpeta, m) for m in carpeta.buscar_mensajes(texto))
+            # se apilan al revés para mantener el mismo orden que el recorrido recursivo
+            pila.extend(reversed(carpeta.subcarpetas.values()))
+        return resultado
 
     # --- Mueve un mensaje desde una carpeta origen a otra carpeta destino ---
     def mover_mensaje(self, carpeta_origen: Carpeta, indice: int, carpeta_destino: Carpeta) -> None:
-        mensaje = carpeta_origen.obtener_por_indice(indice)
-        if mensaje is None:
+        if carpeta_origen.obtener_por_indice(indice) is None:
             raise IndexError("Índice de mensaje fuera de rango.")
-        carpeta_origen.quitar_mensaje(mensaje)
+        mensaje = carpeta_origen.quitar_por_indice(indice)
         carpeta_destino.agregar_mensaje(mensaje)
 
+    # --- Mueve varios mensajes de una vez (índices de la carpeta origen) ---
+    def mover_muchos(self, carpeta_origen: Carpeta, indices: List[int], carpeta_destino: Carpeta) -> None:
+        """Extrae de mayor a menor índice para que los pops no desplacen a los pendientes."""
+        orden = sorted(set(indices), reverse=True)
+        if any(carpeta_origen.obtener_por_indice(i) is None for i in orden):
+            raise IndexError("Índice de mensaje fuera de rango.")
+        movidos = [carpeta_origen.quitar_por_indice(i) for i in orden]
+        # se agregan en el orden original de la carpeta origen
+        for mensaje in reversed(movidos):
+            carpeta_destino.agregar_mensaje(mensaje)
+
 
 # =======================
 #  COLA DE PRIORIDADES
@@ -222,30 +404,70 @@ class SistemaCorreo:
 
 class ColaPrioridades:
     """
-    Cola de prioridades basada en heapq.
+    Cola de prioridades con un balde FIFO por nivel (Alta, Media, Baja).
     Entrega 3: gestionar mensajes 'urgentes'.
+
+    Como hay solo 3 niveles, agregar y procesar son O(1). Con usar_heap=True
+    se usa heapq (O(log n)), útil si los niveles de prioridad pasan a ser muchos.
     """
 
-    # --- Asigna prioridades a numeros para el heap (menor numero = mayor prioridad) ---
-    _valor = {"Alta": 1, "Media": 2, "Baja": 3}
+    def __init__(self, usar_heap: bool = False):
+        self._usar_heap = usar_heap
+        # (prioridad, orden de llegada, mensaje): el contador desempata y evita comparar Mensajes
+        self._heap: List[Tuple[int, int, Mensaje]] = []
+        self._contador = count()
+        # balde i = mensajes con prioridad_num i + 1
+        self._baldes: List[deque] = [deque() for _ in Mensaje._valor_prioridad]
+        self._tamanio = 0
 
-    def __init__(self):
-        self._heap: List[Tuple[int, Mensaje]] = []
+    def __len__(self) -> int:
+        return self._tamanio
+
+    # --- Entrada del heap; agregar y agregar_muchos deben usar siempre esta misma forma ---
+    def _entrada(self, mensaje: Mensaje) -> Tuple[int, int, Mensaje]:
+        return (mensaje._prioridad_num, next(self._contador), mensaje)
 
-    # --- Inserta un mensaje al heap junto con su nivel de prioridad ---
+    # --- Inserta un mensaje en el balde (o heap) de su nivel de prioridad ---
     def agregar(self, mensaje: Mensaje) -> None:
-        prioridad_num = self._valor.get(mensaje.prioridad, 2)
-        heapq.heappush(self._heap, (prioridad_num, mensaje))
+        if self._usar_heap:
+            heapq.heappush(self._heap, self._entrada(mensaje))
+        else:
+            self._baldes[mensaje._prioridad_num - 1].append(mensaje)
+        self._tamanio += 1
+
+    # --- Inserta un lote completo: un solo heapify O(n) en lugar de n heappush ---
+    def agregar_muchos(self, mensajes: Iterable[Mensaje]) -> None:
+        if self._usar_heap:
+            entradas = [self._entrada(m) for m in mensajes]
+            total = len(self._heap) + len(entradas)
+            # heapify cuesta O(total); k heappush cuestan O(k log total)
+            if len(entradas) * total.bit_length() >= total:
+                self._heap.extend(entradas)
+                heapq.heapify(self._heap)
+            else:
+                for entrada in entradas:
+                    heapq.heappush(self._heap, entrada)
+            self._tamanio += len(entradas)
+        else:
+            for m in mensajes:
+                self._baldes[m._prioridad_num - 1].append(m)
+                self._tamanio += 1
 
     # --- EXTRAE Y RETORNA EL MENSAJE CON MAYOR PRIORIDAD ---
     def procesar(self) -> Optional[Mensaje]:
         """Devuelve el mensaje siguiente según prioridad o None si está vacía."""
-        if not self._heap:
+        if not self._tamanio:
             return None
-        return heapq.heappop(self._heap)[1]
+        self._tamanio -= 1
+        if self._usar_heap:
+            return heapq.heappop(self._heap)[2]
+        for balde in self._baldes:
+            if balde:
+                return balde.popleft()
+        return None
 
     def esta_vacia(self) -> bool:
-        return not self._heap
+        return not self._tamanio
 
 
 # =======================
@@ -286,6 +508,11 @@ class ServidorCorreo(IMensajeria):
             "oferta": "Promociones",
             "universidad": "Academicos",
         }
+        # copia inmutable y ordenada de los filtros, para recorrerla sin iterar el dict
+        self._filtros_snapshot: Tuple[Tuple[str, str], ...] = ()
+        self._filtro_pattern: Optional[re.Pattern] = None
+        self._filtro_rango: Dict[str, int] = {}
+        self._compilar_filtros()
         self._cola_prioridades = ColaPrioridades()
 
     @property
@@ -307,15 +534,47 @@ class ServidorCorreo(IMensajeria):
     # --- filtros automáticos ---
     def agregar_filtro(self, palabra_clave: str, carpeta_destino: str) -> None:
         self._filtros[palabra_clave.lower()] = carpeta_destino
+        self._compilar_filtros()
+
+    # --- Une todas las palabras clave en una sola expresión regular (una pasada por el texto) ---
+    def _compilar_filtros(self) -> None:
+        self._filtros_snapshot = tuple(self._filtros.items())
+        if not self._filtros:
+            self._filtro_pattern = None
+            self._filtro_rango = {}
+            return
+        self._filtro_pattern = re.compile("|".join(re.escape(p) for p in self._filtros))
+        # posición de cada filtro: el primero agregado tiene precedencia
+        self._filtro_rango = {p: i for i, p in enumerate(self._filtros)}
+
+    # --- Devuelve el nombre de la carpeta destino según el primer filtro que coincide ---
+    def _carpeta_por_filtros(self, mensaje: Mensaje) -> str:
+        if self._filtro_pattern is None:
+            return "Entrada"
+        # asunto y cuerpo se revisan por separado (sin concatenar); el cuerpo
+        # solo se pasa a minúsculas si hace falta mirarlo
+        asunto = mensaje._asunto_lc
+        cuerpo: Optional[str] = None
+        encontrado = self._filtro_pattern.search(asunto)
+        if encontrado is None:
+            cuerpo = mensaje._cuerpo.lower()
+            encontrado = self._filtro_pattern.search(cuerpo)
+            if encontrado is None:
+                return "Entrada"
+        # la regex devuelve la coincidencia más a la izquierda; solo hace falta revisar
+        # los filtros con más precedencia que ella para respetar el orden de los filtros
+        rango = self._filtro_rango[encontrado.group(0)]
+        for previa, carpeta in self._filtros_snapshot[:rango]:
+            if previa in asunto:
+                return carpeta
+            if cuerpo is None:
+                cuerpo = mensaje._cuerpo.lower()
+            if previa in cuerpo:
+                return carpeta
+        return self._filtros_snapshot[rango][1]
 
     def _aplicar_filtros(self, mensaje: Mensaje, usuario_destino: "Usuario") -> None:
-        texto = (mensaje.asunto + " " + mensaje.cuerpo).lower()
-        carpeta_nombre = "Entrada"
-        for palabra, carpeta in self._filtros.items():
-            if palabra in texto:
-                carpeta_nombre = carpeta
-                break
-        carpeta = usuario_destino.obtener_carpeta(carpeta_nombre)
+        carpeta = usuario_destino.obtener_carpeta(self._carpeta_por_filtros(mensaje))
         carpeta.agregar_mensaje(mensaje)
 
     # --- implementación de la interfaz ---
@@ -336,6 +595,28 @@ class ServidorCorreo(IMensajeria):
             # podría ser un usuario de otro servidor; lo maneja RedServidores
             pass
 
+    # --- Envío en lote (campañas, importaciones) ---
+    def enviar_muchos(self, mensajes: List[Mensaje]) -> None:
+        """
+        Equivale a llamar enviar() por cada mensaje, pero arma el heap de una vez
+        y agrupa las entregas por (usuario, carpeta) para resolver cada carpeta
+        una sola vez.
+        """
+        self._cola_prioridades.agregar_muchos(mensajes)
+
+        # un solo dict ordenado: la copia del remitente y la entrega comparten
+        # clave si un filtro manda a "Enviados", y conservan el orden de enviar()
+        entregas: Dict[Tuple[str, str], List[Mensaje]] = defaultdict(list)
+        for m in mensajes:
+            if m._remitente in self._usuarios:
+                entregas[(m._remitente, "Enviados")].append(m)
+            # destinatarios de otros servidores se ignoran, igual que en enviar()
+            if m._destinatario in self._usuarios:
+                entregas[(m._destinatario, self._carpeta_por_filtros(m))].append(m)
+
+        for (email, carpeta_nombre), grupo in entregas.items():
+            self._usuarios[email].obtener_carpeta(carpeta_nombre).agregar_muchos(grupo)
+
     def procesar_mensajes_prioritarios(self) -> None:
         """Muestra los mensajes según prioridad (Alta primero)."""
         print("\nProcesando mensajes por prioridad:")
@@ -378,18 +659,23 @@ class RedServidores:
 
     # --- BFS (para encontrar ruta más corta de servidores) ---
     def bfs(self, origen: str, destino: str) -> Optional[List[str]]:
-        visitados = set()
-        cola: List[Tuple[str, List[str]]] = [(origen, [origen])]
+        # deque: popleft en O(1); el camino se reconstruye desde 'padres'
+        cola = deque([origen])
+        padres: Dict[str, Optional[str]] = {origen: None}
         while cola:
-            actual, camino = cola.pop(0)
+            actual = cola.popleft()
             if actual == destino:
+                camino: List[str] = []
+                nodo: Optional[str] = actual
+                while nodo is not None:
+                    camino.append(nodo)
+                    nodo = padres[nodo]
+                camino.reverse()
                 return camino
-            if actual in visitados:
-                continue
-            visitados.add(actual)
-            for vecino in self._conexiones.get(actual, []):
-                if vecino not in visitados:
-                    cola.append((vecino, camino + [vecino]))
+            for vecino in self._conexiones.get(actual, ()):
+                if vecino not in padres:
+                    padres[vecino] = actual
+                    cola.append(vecino)
         return None
 
     # --- DFS (para recorrer toda la red) ---
@@ -398,9 +684,15 @@ class RedServidores:
             visitados = set()
         visitados.add(origen)
         resultado = [origen]
-        for vecino in self._conexiones.get(origen, []):
-            if vecino not in visitados:
-                resultado.extend(self.dfs(vecino, visitados))
+        # vecinos al revés: se visitan en el mismo orden que la versión recursiva
+        pila = [v for v in reversed(self._conexiones.get(origen, ())) if v not in visitados]
+        while pila:
+            actual = pila.pop()
+            if actual in visitados:
+                continue
+            visitados.add(actual)
+            resultado.append(actual)
+            pila.extend(v for v in reversed(self._conexiones.get(actual, ())) if v not in visitados)
         return resultado
 
     # --- envío entre servidores usando la ruta BFS ---
@@ -574,7 +866,7 @@ def explorar_arbol(usuario: Usuario) -> None:
                 if num < 1 or num > len(c.subcarpetas):
                     print("Fuera de rango.")
                     continue
-                sub = list(c.subcarpetas.values())[num - 1]
+                sub = next(islice(c.subcarpetas.values(), num - 1, num))
                 _explorar(sub)
             elif op == "2":
                 return